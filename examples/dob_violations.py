@@ -1,4 +1,3 @@
-import datetime
 from pathlib import Path
 
 import pandas
@@ -13,10 +12,15 @@ here = Path(__file__)
 def run() -> None:
     print("loading data")
     df = pandas.read_pickle("examples/dob_violations.pickle")
+    # The pickle stores datetime.date objects; convert them once so that
+    # comparisons and arithmetic are vectorized
+    for column in ["issue_date", "disposition_date", "now"]:
+        df[column] = pandas.to_datetime(df[column])
     print(df["issue_date"])
     print(df["issue_date"].dtype)
-    print(df["issue_date"] < datetime.date(2018, 1, 1))
-    df = df[df["issue_date"] < datetime.date(2018, 1, 1)]
+    cutoff = pandas.Timestamp(2018, 1, 1)
+    print(df["issue_date"] < cutoff)
+    df = df[df["issue_date"] < cutoff]
 
     print("converting to arrays")
     unit, groups, (G, B, T) = convoys.utils.get_arrays(
@@ -47,9 +51,8 @@ def run() -> None:
         pyplot.savefig(fig_path)
 
     pyplot.figure(figsize=(9, 6))
-    df["bucket"] = df["issue_date"].apply(
-        lambda d: "%d-%d" % (5 * (d.year // 5), 5 * (d.year // 5) + 4)
-    )
+    bucket_start = df["issue_date"].dt.year // 5 * 5
+    df["bucket"] = bucket_start.astype(str) + "-" + (bucket_start + 4).astype(str)
     unit, groups, (G, B, T) = convoys.utils.get_arrays(
         df,
         groups="bucket",
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import numpy
 import pandas
 from matplotlib import pyplot
 
@@ -10,7 +11,7 @@ import convoys.utils
 def run() -> None:
     print("loading data")
     df = pandas.read_pickle("examples/marriage.pickle")
-    df = df.sample(1000)  # speed up
+    df = df.sample(1000, random_state=numpy.random.default_rng(0))  # speed up
     print(df)
 
     _, groups, (G, B, T) = convoys.utils.get_arrays(
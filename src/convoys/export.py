@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from math import floor
-from typing import TYPE_CHECKING, Callable, Hashable, Literal
+from typing import TYPE_CHECKING, Hashable, Literal
 
 import numpy
 import pandas
@@ -9,20 +9,11 @@ import pandas
 import convoys.multi
 
 if TYPE_CHECKING:
-    pass
+    from numpy.typing import DTypeLike
 
 __all__ = ["export_cohorts"]
 
 
-_models: dict[str, Callable[[bool], convoys.multi.MultiModel]] = {
-    "kaplan-meier": lambda _: convoys.multi.KaplanMeier(),
-    "exponential": lambda ci: convoys.multi.Exponential(mcmc=ci),
-    "weibull": lambda ci: convoys.multi.Weibull(mcmc=ci),
-    "gamma": lambda ci: convoys.multi.Gamma(mcmc=ci),
-    "generalized-gamma": lambda ci: convoys.multi.GeneralizedGamma(mcmc=ci),
-}
-
-
 def export_cohorts(
     G: numpy.ndarray,
     B: numpy.ndarray,
@@ -35,6 +26,7 @@ def export_cohorts(
     ci: float | None = None,
     groups: list[Hashable] | None = None,
     specific_groups: list[Hashable] | None = None,
+    dtype: "DTypeLike" = numpy.float32,
 ) -> pandas.DataFrame:
     """Helper function to fit data using a model and then
     export the model predictions as a DataFrame. The Dataframe will
@@ -58,52 +50,55 @@ def export_cohorts(
         no confidence interval is to be plotted
     :param groups: list of group labels
     :param specific_groups: subset of groups to plot
+    :param dtype: (optional, default is float32) dtype of the prediction columns
 
     See  :meth:`convoys.utils.get_arrays` which is handy for converting
     a Pandas dataframe into arrays `G`, `B`, `T`.
     """
 
-    if model not in _models.keys():
-        if not isinstance(model, convoys.multi.MultiModel):
-            raise ValueError("model incorrectly specified")
+    G = numpy.asarray(G, dtype=numpy.intp)
+    B = numpy.asarray(B)
+    T = numpy.asarray(T)
+    m = convoys.multi._get_model(model, bool(ci), G, B, T)
 
     if groups is None:
-        groups = list(set(G))
+        groups = numpy.unique(G).tolist()
 
     # Set x scale
     if t_max is None:
-        t_max = max(T)
-    if not isinstance(model, convoys.multi.MultiModel):
-        # Fit model
-        m = _models[model](bool(ci))
-        m.fit(G, B, T)
-    else:
-        m = model
+        t_max = float(T.max())
 
     if specific_groups is None:
         specific_groups = groups
 
-    if len(set(specific_groups).intersection(groups)) != len(specific_groups):
+    group2j = {group: j for j, group in enumerate(groups)}
+    if not group2j.keys() >= set(specific_groups):
         raise ValueError("specific_groups not a subset of groups!")
 
     RESULT_LENGTH = floor(t_max + 1)
     t = numpy.arange(RESULT_LENGTH)
-    data: list[pandas.DataFrame] = []
-
-    for group in specific_groups:
-        j = groups.index(group)  # matching index of group
-
-        if ci is not None:
-            result = m.predict_ci(j, t, ci=ci)
-            result_df = pandas.DataFrame(
-                data=result, columns=["prediction_value", "ci_low", "ci_high"]
-            )
-        else:
-            result = m.predict(j, t)
-            result_df = pandas.DataFrame(data=result, columns=["prediction_value"])
-        result_df["t"] = t
-        result_df["group"] = group
-        data.append(result_df)
-
-    unioned_data = pandas.concat(data)
+
+    js = [group2j[group] for group in specific_groups]  # matching index of group
+    if ci is not None:
+        results = m.predict_ci_many(js, t, ci=ci)
+        columns = ["prediction_value", "ci_low", "ci_high"]
+    else:
+        results = m.predict_many(js, t)
+        columns = ["prediction_value"]
+    results = results.astype(dtype, copy=False)
+
+    # Build the output in one shot, one block of RESULT_LENGTH rows per group.
+    # Each block is indexed by t, like the per-group frames used to be.
+    n_groups = len(specific_groups)
+    t_col = numpy.tile(t, n_groups)
+    unioned_data = pandas.DataFrame(
+        data=results.reshape(n_groups * RESULT_LENGTH, len(columns)),
+        columns=columns,
+        index=t_col,
+    )
+    unioned_data["t"] = t_col
+    # Let pandas infer the dtype of the labels, e.g. int64 for integer groups
+    unioned_data["group"] = (
+        pandas.Series(specific_groups).repeat(RESULT_LENGTH).to_numpy()
+    )
     return unioned_data
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Callable, Generic, Hashable, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Generic, Hashable, Sequence, TypeVar
 
 import numpy
 
@@ -29,6 +31,24 @@ class MultiModel(ABC, Generic[T_Group]):
     def predict_ci(self, group: T_Group, t: "ArrayLike", ci: float) -> "ndarray":
         raise NotImplementedError("Need to implement predict_ci")
 
+    def predict_many(self, groups: Sequence[T_Group], t: "ArrayLike") -> "ndarray":
+        """Works like :meth:`predict` for several groups at once.
+
+        The return value will contain one more leading dimension than for
+        :meth:`predict`, in the same order as `groups`.
+        """
+        return numpy.stack([self.predict(group, t) for group in groups])
+
+    def predict_ci_many(
+        self, groups: Sequence[T_Group], t: "ArrayLike", ci: float
+    ) -> "ndarray":
+        """Works like :meth:`predict_ci` for several groups at once.
+
+        The return value will contain one more leading dimension than for
+        :meth:`predict_ci`, in the same order as `groups`.
+        """
+        return numpy.stack([self.predict_ci(group, t, ci) for group in groups])
+
 
 class RegressionToMulti(MultiModel["ArrayLike"]):
     _base_model_cls: type[regression.RegressionModel]
@@ -46,17 +66,23 @@ class RegressionToMulti(MultiModel["ArrayLike"]):
         :param T: numpy array of shape :math:`n`, containing floats representing the
             time delta :math:`t` between creation and either conversion or censoring.
         """
-        G = numpy.array(G, dtype=int)
+        G = numpy.asarray(G, dtype=numpy.intp)
         (n,) = G.shape
-        self._n_groups = max(G) + 1
-        X = numpy.zeros((n, self._n_groups), dtype=numpy.bool)
-        for i, group in enumerate(G):
-            X[i, group] = 1
+        self._n_groups = int(G.max()) + 1
+        # Use the same dtype as the model parameters, so that the dot products
+        # in the loss don't need to cast X on every evaluation
+        X = numpy.zeros((n, self._n_groups), dtype=numpy.float64)
+        X[numpy.arange(n), G] = 1.0
         self.base_model.fit(X, B, T)
+        # Rows of the identity are the feature vectors of single groups
+        self._eye = numpy.eye(self._n_groups)
+        self._eye.flags.writeable = False
 
     def _get_x(self, group: "ArrayLike") -> "ndarray":
+        if isinstance(group, int | numpy.integer):
+            return self._eye[group]  # type: ignore[no-any-return]
         x = numpy.zeros(self._n_groups)
-        g = numpy.array(group)
+        g = numpy.asarray(group)
         x[g] = 1
         return x
 
@@ -66,6 +92,14 @@ class RegressionToMulti(MultiModel["ArrayLike"]):
     def predict_ci(self, group: "ArrayLike", t: "ArrayLike", ci: float) -> "ndarray":
         return self.base_model.predict_ci(self._get_x(group), t, ci)
 
+    def predict_many(self, groups: Sequence["ArrayLike"], t: "ArrayLike") -> "ndarray":
+        # Stack one feature vector per group, with singleton axes so that they
+        # broadcast against every dimension of t in a single call
+        t = numpy.asarray(t)
+        X = numpy.stack([self._get_x(group) for group in groups])
+        X = X.reshape((len(groups),) + (1,) * t.ndim + (self._n_groups,))
+        return self.base_model.predict(X, t)
+
     def rvs(
         self, group: "ArrayLike", *args: Any, **kwargs: Any
     ) -> tuple["ndarray", "ndarray"]:
@@ -75,10 +109,11 @@ class RegressionToMulti(MultiModel["ArrayLike"]):
 class SingleToMulti(MultiModel[Hashable]):
     _base_model_cls: type[single.SingleModel]
 
-    def __init__(self, *args: Any, **kwargs: Any):
+    def __init__(self, *args: Any, n_jobs: int = 1, **kwargs: Any):
         self.base_model_init: Callable[[], single.SingleModel] = (
             lambda: self._base_model_cls(*args, **kwargs)
         )
+        self._n_jobs = n_jobs
 
     def fit(self, G: "ArrayLike", B: "ArrayLike", T: "ArrayLike") -> None:
         """Fits the model
@@ -90,16 +125,30 @@ class SingleToMulti(MultiModel[Hashable]):
         :param T: numpy array of shape :math:`n`, containing floats representing the
             time delta :math:`t` between creation and either conversion or censoring.
         """
-        G = numpy.array(G)
-        B = numpy.array(B)
-        T = numpy.array(T)
-        group2bt: dict[Hashable, list[tuple]] = {}
-        for g, b, t in zip(G, B, T, strict=False):
-            group2bt.setdefault(g, []).append((b, t))
-        self._group2model: dict[Hashable, single.SingleModel] = {}
-        for g, BT in group2bt.items():
-            self._group2model[g] = self.base_model_init()
-            self._group2model[g].fit([b for b, t in BT], [t for b, t in BT])
+        G = numpy.asarray(G)
+        B = numpy.asarray(B)
+        T = numpy.asarray(T)
+        # Sort by group so that each group's rows form a contiguous slice
+        order = numpy.argsort(G, kind="stable")
+        G, B, T = G[order], B[order], T[order]
+        unique_groups, starts = numpy.unique(G, return_index=True)
+        ends = numpy.append(starts[1:], len(G))
+
+        def fit_group(start: int, end: int) -> single.SingleModel:
+            model = self.base_model_init()
+            model.fit(B[start:end], T[start:end])
+            return model
+
+        # Groups are independent, so they can be fit concurrently
+        if self._n_jobs == 1:
+            models = list(map(fit_group, starts, ends))
+        else:
+            max_workers = None if self._n_jobs == -1 else self._n_jobs
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                models = list(executor.map(fit_group, starts, ends))
+        self._group2model: dict[Hashable, single.SingleModel] = dict(
+            zip(unique_groups, models, strict=True)
+        )
 
     def predict(self, group: Hashable, t: "ArrayLike") -> "ndarray":
         return self._group2model[group].predict(t)
@@ -133,6 +182,39 @@ class GeneralizedGamma(RegressionToMulti):
 
 
 class KaplanMeier(SingleToMulti):
-    """Multi-group version of :class:`convoys.single.KaplanMeier`."""
+    """Multi-group version of :class:`convoys.single.KaplanMeier`.
+
+    :param n_jobs: int, defaults to 1. Number of threads used to fit the
+        groups concurrently. Use -1 to pick a default based on the number
+        of CPUs.
+    """
 
     _base_model_cls = single.KaplanMeier
+
+
+# Constructors for the models that can be referred to by name, e.g. in
+# :func:`convoys.plotting.plot_cohorts`. Each one takes a flag denoting whether
+# a confidence interval will be needed.
+_models: MappingProxyType[str, Callable[[bool], MultiModel]] = MappingProxyType(
+    {
+        "kaplan-meier": lambda _: KaplanMeier(),
+        "exponential": lambda ci: Exponential(mcmc=ci),
+        "weibull": lambda ci: Weibull(mcmc=ci),
+        "gamma": lambda ci: Gamma(mcmc=ci),
+        "generalized-gamma": lambda ci: GeneralizedGamma(mcmc=ci),
+    }
+)
+
+
+def _get_model(
+    model: str | MultiModel, ci: bool, G: "ArrayLike", B: "ArrayLike", T: "ArrayLike"
+) -> MultiModel:
+    # Returns model as is if it is already a model instance. Otherwise, creates
+    # the model with that name and fits it to G, B, T
+    if isinstance(model, MultiModel):
+        return model
+    if model not in _models:
+        raise ValueError("model incorrectly specified")
+    m = _models[model](ci)
+    m.fit(G, B, T)
+    return m
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Callable, Hashable, Literal
+from typing import TYPE_CHECKING, Any, Hashable, Literal
 
 import numpy
 from matplotlib import pyplot
@@ -12,14 +12,7 @@ if TYPE_CHECKING:
 
 __all__ = ["plot_cohorts"]
 
-
-_models: dict[str, Callable[[bool], convoys.multi.MultiModel]] = {
-    "kaplan-meier": lambda _: convoys.multi.KaplanMeier(),
-    "exponential": lambda ci: convoys.multi.Exponential(mcmc=ci),
-    "weibull": lambda ci: convoys.multi.Weibull(mcmc=ci),
-    "gamma": lambda ci: convoys.multi.Gamma(mcmc=ci),
-    "generalized-gamma": lambda ci: convoys.multi.GeneralizedGamma(mcmc=ci),
-}
+_MAX_CI_POINTS = 300
 
 
 def plot_cohorts(
@@ -38,6 +31,8 @@ def plot_cohorts(
     groups: list[Hashable] | None = None,
     specific_groups: list[Hashable] | None = None,
     label_fmt: str = "%(group)s (n=%(n).0f, k=%(k).0f)",
+    n_points: int = 200,
+    spacing: Literal["linear", "log"] = "log",
 ) -> convoys.multi.MultiModel:
     """Helper function to fit data using a model and then plot the cohorts.
 
@@ -61,52 +56,86 @@ def plot_cohorts(
     :param groups: list of group labels
     :param specific_groups: subset of groups to plot
     :param label_fmt: custom format for the labels to use in the legend
+    :param n_points: (optional, default is 200) number of values of t at which
+        the curves are evaluated, at least 2. If ci is not None, at most 300 of
+        them are used.
+    :param spacing: (optional, default is log) spacing of the values of t.
+        Either 'linear' or 'log'; the latter puts more points early on, where
+        the curves change the most.
 
     See  :meth:`convoys.utils.get_arrays` which is handy for converting
     a Pandas dataframe into arrays `G`, `B`, `T`.
     """
 
-    if model not in _models.keys():
-        if not isinstance(model, convoys.multi.MultiModel):
-            raise ValueError("model incorrectly specified")
+    if spacing not in ("linear", "log"):
+        raise ValueError("spacing must be one of `linear` or `log`")
+    if n_points < 2:
+        raise ValueError("n_points must be at least 2")
+
+    G = numpy.asarray(G, dtype=numpy.intp)
+    B = numpy.asarray(B)
+    T = numpy.asarray(T)
+    m = convoys.multi._get_model(model, bool(ci), G, B, T)
 
     if groups is None:
-        groups = list(set(G))
+        groups = numpy.unique(G).tolist()
 
     if ax is None:
         ax = pyplot.gca()
 
     # Set x scale
     if t_max is None:
-        _, t_max = ax.get_xlim()
-        t_max = max(t_max, max(T))
-    if not isinstance(model, convoys.multi.MultiModel):
-        # Fit model
-        m = _models[model](bool(ci))
-        m.fit(G, B, T)
-    else:
-        m = model
+        _, x_max = ax.get_xlim()
+        t_max = max(x_max, float(T.max()))
 
     if specific_groups is None:
         specific_groups = groups
 
-    if len(set(specific_groups).intersection(groups)) != len(specific_groups):
+    group2j = {group: j for j, group in enumerate(groups)}
+    if not group2j.keys() >= set(specific_groups):
         raise ValueError("specific_groups not a subset of groups!")
 
+    # Count observations and conversions for every group in a single pass
+    n_per_group = numpy.bincount(G, minlength=len(groups))
+    k_per_group = numpy.bincount(G, weights=B, minlength=len(groups))
+
     # Plot
-    t = numpy.linspace(0, t_max, 1000)  # type: ignore[arg-type]
+    # Predictions are only displayed, so single precision is plenty
+    if spacing == "log" and t_max > 0:
+        t = numpy.concatenate(
+            (
+                numpy.zeros(1, dtype=numpy.float32),
+                numpy.geomspace(
+                    t_max / 1000.0,
+                    t_max,
+                    n_points - 1,
+                    dtype=numpy.float32,
+                ),
+            )
+        )
+    else:
+        # A log spacing needs a positive t_max
+        t = numpy.linspace(0, t_max, n_points, dtype=numpy.float32)
+    if ci is not None and len(t) > _MAX_CI_POINTS:
+        # Confidence intervals are costly to compute and to fill, so keep an
+        # evenly spread subset of the grid
+        t = t[numpy.linspace(0, len(t) - 1, _MAX_CI_POINTS).round().astype(int)]
     _, y_max = ax.get_ylim()
+    js = [group2j[group] for group in specific_groups]  # matching index of group
+    if ci is not None:
+        predictions = m.predict_ci_many(js, t, ci=ci)
+    else:
+        predictions = m.predict_many(js, t)
+    predictions = predictions.astype(numpy.float32, copy=False)
     # Reset to first color
     ax.set_prop_cycle(None)  # type:ignore[call-overload]
-    for group in specific_groups:
-        j = groups.index(group)  # matching index of group
-
-        n = numpy.sum(G == j)
-        k = numpy.sum(B[G == j])
+    for group, j, prediction in zip(specific_groups, js, predictions, strict=True):
+        n = n_per_group[j]
+        k = k_per_group[j]
         label = label_fmt % dict(group=group, n=n, k=k)
 
         if ci is not None:
-            p_y, p_y_lo, p_y_hi = m.predict_ci(j, t, ci=ci).T
+            p_y, p_y_lo, p_y_hi = prediction.T
             merged_plot_ci_kwargs = {"alpha": 0.2}
             if plot_ci_kwargs is not None:
                 merged_plot_ci_kwargs.update(plot_ci_kwargs)
@@ -118,7 +147,7 @@ def plot_cohorts(
             )
             color = p.get_facecolor()[0]  # reuse color for the line
         else:
-            p_y = m.predict(j, t).T
+            p_y = prediction.T
             color = None
 
         merged_plot_kwargs = {"color": color, "linewidth": 1.5, "alpha": 0.7}
@@ -1,20 +1,24 @@
 from __future__ import annotations
 
+import contextlib
+import multiprocessing
+import os
 import warnings
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Callable, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 import emcee  # type: ignore[import-untyped]
 import numpy
 import progressbar
 import scipy.optimize  # type: ignore[import-untyped]
-from scipy.special import gammaincinv  # type: ignore[import-untyped]
+import scipy.special  # type: ignore[import-untyped]
 
 with warnings.catch_warnings():
     # we have pinned numpy and SciPy, so we can ignore the deprecation warnings
     # issued by autograd 1.7
     warnings.filterwarnings("ignore", category=DeprecationWarning)
     import autograd  # type: ignore[import-untyped]
+    from autograd.extend import defvjp, primitive  # type: ignore[import-untyped]
     from autograd.numpy import (  # type: ignore[import-untyped]
         dot,
         exp,
@@ -22,83 +26,226 @@ with warnings.catch_warnings():
         log,
         sum,  # noqa: A004
     )
+    from autograd.numpy.numpy_vjps import unbroadcast_f  # type: ignore[import-untyped]
     from autograd.scipy.special import expit, gammaln  # type: ignore[import-untyped]
-    from autograd_gamma import gammainc  # type: ignore[import-untyped]
 
 if TYPE_CHECKING:
-    from numpy.typing import ArrayLike
+    from numpy.typing import ArrayLike, DTypeLike
 
 
 __all__ = ["Exponential", "Weibull", "Gamma", "GeneralizedGamma"]
 
+# Regularized lower incomplete gamma function, differentiable with autograd.
+# Like autograd_gamma.gammainc, but the derivative with respect to k (which
+# has no closed form) uses a two-point central difference instead of a
+# four-point one, which halves the number of gammainc evaluations over the
+# data in every backward pass. Its error is far below the tolerance of the
+# optimizer.
+gammainc = primitive(scipy.special.gammainc)
+
+
+def _gammainc_vjp_k(ans: numpy.ndarray, k: numpy.ndarray, u: numpy.ndarray) -> Any:
+    eps = numpy.finfo(numpy.result_type(k, 1.0)).eps
+    delta = numpy.maximum(k * eps ** (1 / 3), 1e-7)
+    delta = (k + delta) - k  # make sure k + delta is exactly representable
+    return unbroadcast_f(
+        k,
+        lambda g: g
+        * (scipy.special.gammainc(k + delta, u) - scipy.special.gammainc(k - delta, u))
+        / (2 * delta),
+    )
+
+
+def _gammainc_vjp_u(ans: numpy.ndarray, k: numpy.ndarray, u: numpy.ndarray) -> Any:
+    return unbroadcast_f(
+        u,
+        lambda g: g * numpy.exp(-u + numpy.log(u) * (k - 1) - scipy.special.gammaln(k)),
+    )
+
+
+defvjp(gammainc, _gammainc_vjp_k, _gammainc_vjp_u)
+
+# Upper bound on the size of the (walkers, n) arrays used to evaluate several
+# MCMC walkers in one vectorized pass. Larger batches fall out of the CPU cache
+# and end up slower than evaluating the walkers one at a time.
+_MAX_BATCH_SIZE = 2**14
+
 
 def generalized_gamma_loss(
-    x: tuple[float, ...],
+    x: numpy.ndarray,
     X: numpy.ndarray,
-    B: numpy.ndarray,
     T: numpy.ndarray,
-    W: numpy.ndarray,
+    log_T: numpy.ndarray,
+    WB: numpy.ndarray,
+    W1mB: numpy.ndarray,
     fix_k: int | None,
     fix_p: int | None,
     hierarchical: bool,
     flavor: Literal["logistic", "linear"],
-    callback: Callable[[float], None] | None = None,
-) -> float:
-    k = exp(x[0]) if fix_k is None else fix_k
-    p = exp(x[1]) if fix_p is None else fix_p
-    log_sigma_alpha = x[2]
-    log_sigma_beta = x[3]
-    a = x[4]
-    b = x[5]
-    n_features = int((len(x) - 6) / 2)
-    alpha = x[6 : 6 + n_features]
-    beta = x[6 + n_features : 6 + 2 * n_features]
-    lambd = exp(dot(X, alpha) + a)
+) -> float | numpy.ndarray:
+    # x can also be a 2-D array with one parameter vector per row, in which
+    # case the log-likelihood of each one is returned. Slicing (rather than
+    # indexing) x keeps a trailing axis that broadcasts against the data.
+    if x.dtype != X.dtype:
+        x = x.astype(X.dtype)  # evaluate in the (possibly reduced) data precision
+    k = exp(x[..., 0:1]) if fix_k is None else fix_k
+    p = exp(x[..., 1:2]) if fix_p is None else fix_p
+    log_sigma_alpha = x[..., 2]
+    log_sigma_beta = x[..., 3]
+    a = x[..., 4:5]
+    b = x[..., 5:6]
+    n_features = int((x.shape[-1] - 6) / 2)
+    alpha = x[..., 6 : 6 + n_features]
+    beta = x[..., 6 + n_features : 6 + 2 * n_features]
+    lambd = exp(dot(alpha, X.T) + a)
 
     # PDF: p*lambda^(k*p) / gamma(k) * t^(k*p-1) * exp(-(x*lambda)^p)
-    log_pdf = (
-        log(p)
-        + (k * p) * log(lambd)
-        - gammaln(k)
-        + (k * p - 1) * log(T)
-        - (T * lambd) ** p
-    )
-    cdf = gammainc(k, (T * lambd) ** p)
+    u = (T * lambd) ** p
+    log_pdf = log(p) + (k * p) * log(lambd) - gammaln(k) + (k * p - 1) * log_T - u
+    cdf = gammainc(k, u)
 
     if flavor == "logistic":  # Log-likelihood with sigmoid
-        c = expit(dot(X, beta) + b)
+        c = expit(dot(beta, X.T) + b)
         LL_observed = log(c) + log_pdf
         LL_censored = log((1 - c) + c * (1 - cdf))
     elif flavor == "linear":  # L2 loss, linear
-        c = dot(X, beta) + b
+        c = dot(beta, X.T) + b
         LL_observed = -((1 - c) ** 2) + log_pdf
         LL_censored = -((c * cdf) ** 2)
 
-    LL_data = sum(W * B * LL_observed + W * (1 - B) * LL_censored, 0)
+    # WB = W * B and W1mB = W * (1 - B) do not depend on x, so they are
+    # precomputed once in fit
+    LL_data = sum(WB * LL_observed + W1mB * LL_censored, -1)
 
     if hierarchical:
         # Hierarchical model with sigmas ~ invgamma(1, 1)
+        inv_var_alpha = exp(-2 * log_sigma_alpha)  # 1 / sigma_alpha^2
+        inv_var_beta = exp(-2 * log_sigma_beta)  # 1 / sigma_beta^2
         LL_prior_a = (
-            -4 * log_sigma_alpha
-            - 1 / exp(log_sigma_alpha) ** 2
-            - dot(alpha, alpha) / (2 * exp(log_sigma_alpha) ** 2)
-            - n_features * log_sigma_alpha
+            -(4 + n_features) * log_sigma_alpha
+            - inv_var_alpha
+            - 0.5 * sum(alpha * alpha, -1) * inv_var_alpha
         )
         LL_prior_b = (
-            -4 * log_sigma_beta
-            - 1 / exp(log_sigma_beta) ** 2
-            - dot(beta, beta) / (2 * exp(log_sigma_beta) ** 2)
-            - n_features * log_sigma_beta
+            -(4 + n_features) * log_sigma_beta
+            - inv_var_beta
+            - 0.5 * sum(beta * beta, -1) * inv_var_beta
         )
-        LL: float = LL_prior_a + LL_prior_b + LL_data
+        LL = LL_prior_a + LL_prior_b + LL_data
     else:
         LL = LL_data
 
+    if numpy.ndim(LL) > 0:
+        return numpy.where(numpy.isnan(LL), -numpy.inf, LL)
     if isnan(LL):
         return -numpy.inf
-    if callback is not None:
-        callback(LL)
-    return LL
+    return LL  # type: ignore[no-any-return]
+
+
+# Loss arguments of the MCMC worker processes, set once per process by
+# _init_pool_worker so that only the walkers are sent with each task
+_pool_loss_args: tuple[Any, ...] = ()
+
+
+def _init_pool_worker(*args: Any) -> None:
+    global _pool_loss_args
+    _pool_loss_args = args
+
+
+def _pool_loss(x: numpy.ndarray) -> float | numpy.ndarray:
+    return generalized_gamma_loss(x, *_pool_loss_args)
+
+
+def weibull_loss_and_grad(
+    x: numpy.ndarray,
+    X: numpy.ndarray,
+    T: numpy.ndarray,
+    log_T: numpy.ndarray,
+    WB: numpy.ndarray,
+    W1mB: numpy.ndarray,
+    fix_k: int | None,
+    fix_p: int | None,
+    hierarchical: bool,
+    flavor: Literal["logistic", "linear"],
+) -> tuple[float, numpy.ndarray]:
+    # Same log-likelihood as generalized_gamma_loss with k = 1 (which covers
+    # the Exponential and Weibull models), along with its gradient in closed
+    # form. The CDF is then 1 - exp(-u), so no incomplete gamma is needed.
+    assert fix_k == 1
+    grad = numpy.zeros_like(x)
+    x = x.astype(X.dtype, copy=False)
+    p = numpy.exp(x[1]) if fix_p is None else fix_p
+    log_sigma_alpha = x[2]
+    log_sigma_beta = x[3]
+    a = x[4]
+    b = x[5]
+    n_features = int((len(x) - 6) / 2)
+    alpha = x[6 : 6 + n_features]
+    beta = x[6 + n_features : 6 + 2 * n_features]
+    log_lambd = numpy.dot(X, alpha) + a
+    eta = numpy.dot(X, beta) + b
+
+    # PDF: p*lambda^p * t^(p-1) * exp(-(x*lambda)^p)
+    # Round-trip through exp so that lambda underflows to 0 (and the
+    # log-likelihood to NaN) exactly like in generalized_gamma_loss
+    log_T_lambd = log_T + numpy.log(numpy.exp(log_lambd))
+    u = numpy.exp(p * log_T_lambd)
+    log_pdf = numpy.log(p) + p * log_T_lambd - log_T - u
+    cdf = -numpy.expm1(-u)
+    # Derivatives of log_pdf and of the CDF with respect to log(lambda)
+    d_log_pdf = p * (1 - u)
+    d_cdf = (1 - cdf) * p * u
+
+    if flavor == "logistic":  # Log-likelihood with sigmoid
+        c = scipy.special.expit(eta)
+        censored = (1 - c) + c * (1 - cdf)
+        LL_observed = numpy.log(c) + log_pdf
+        LL_censored = numpy.log(censored)
+        d_observed_eta = 1 - c
+        d_censored_eta = -c * (1 - c) * cdf / censored
+        d_censored_cdf = -c / censored
+    elif flavor == "linear":  # L2 loss, linear
+        c = eta
+        LL_observed = -((1 - c) ** 2) + log_pdf
+        LL_censored = -((c * cdf) ** 2)
+        d_observed_eta = 2 * (1 - c)
+        d_censored_eta = -2 * c * cdf**2
+        d_censored_cdf = -2 * c**2 * cdf
+
+    LL = numpy.dot(WB, LL_observed) + numpy.dot(W1mB, LL_censored)
+    grad_log_lambd = WB * d_log_pdf + W1mB * d_censored_cdf * d_cdf
+    grad_eta = WB * d_observed_eta + W1mB * d_censored_eta
+
+    if fix_p is None:
+        # d/d(log p) of log_pdf and of the CDF
+        d_log_pdf_p = 1 + p * log_T_lambd * (1 - u)
+        d_cdf_p = (1 - cdf) * p * log_T_lambd * u
+        grad[1] = numpy.dot(WB, d_log_pdf_p) + numpy.dot(W1mB, d_censored_cdf * d_cdf_p)
+    grad[4] = numpy.sum(grad_log_lambd)
+    grad[5] = numpy.sum(grad_eta)
+    grad[6 : 6 + n_features] = numpy.dot(grad_log_lambd, X)
+    grad[6 + n_features : 6 + 2 * n_features] = numpy.dot(grad_eta, X)
+
+    if hierarchical:
+        # Hierarchical model with sigmas ~ invgamma(1, 1)
+        inv_var_alpha = numpy.exp(-2 * log_sigma_alpha)  # 1 / sigma_alpha^2
+        inv_var_beta = numpy.exp(-2 * log_sigma_beta)  # 1 / sigma_beta^2
+        alpha_sq = numpy.dot(alpha, alpha)
+        beta_sq = numpy.dot(beta, beta)
+        LL += (
+            -(4 + n_features) * (log_sigma_alpha + log_sigma_beta)
+            - inv_var_alpha * (1 + 0.5 * alpha_sq)
+            - inv_var_beta * (1 + 0.5 * beta_sq)
+        )
+        grad[2] = -(4 + n_features) + inv_var_alpha * (2 + alpha_sq)
+        grad[3] = -(4 + n_features) + inv_var_beta * (2 + beta_sq)
+        grad[6 : 6 + n_features] -= alpha * inv_var_alpha
+        grad[6 + n_features : 6 + 2 * n_features] -= beta * inv_var_beta
+
+    if numpy.isnan(LL):
+        # The log-likelihood is then a constant, with a zero gradient
+        return -numpy.inf, numpy.zeros_like(grad)
+    return LL, grad
 
 
 class RegressionModel(ABC):
@@ -147,6 +294,14 @@ class GeneralizedGamma(RegressionModel):
         linear model is fit, where the beta params will be completely
         additive. This creates a much more interpretable model, with some
         minor loss of accuracy.
+    :param n_jobs: int, defaults to 1. Number of processes used to evaluate
+        the walkers in parallel when sampling with MCMC. Use -1 to use all
+        CPUs.
+    :param dtype: defaults to float64. Floating point type used to evaluate
+        the loss. float32 roughly halves the memory traffic of the fit on
+        large inputs, at the expense of precision; the parameters themselves
+        are always optimized in float64. Consider keeping float64 with MCMC
+        or the linear flavor.
 
     This mostly follows the `Wikipedia article
     <https://en.wikipedia.org/wiki/Generalized_gamma_distribution>`_, although
@@ -234,12 +389,16 @@ class GeneralizedGamma(RegressionModel):
         fix_p: int | None = None,
         hierarchical: bool = True,
         flavor: Literal["logistic", "linear"] = "logistic",
+        n_jobs: int = 1,
+        dtype: "DTypeLike" = numpy.float64,
     ) -> None:
         self._mcmc = mcmc
         self._fix_k = fix_k
         self._fix_p = fix_p
         self._hierarchical = hierarchical
         self._flavor = flavor
+        self._n_jobs = n_jobs
+        self._dtype = dtype
 
     def fit(
         self,
@@ -268,14 +427,19 @@ class GeneralizedGamma(RegressionModel):
             Z if isinstance(Z, numpy.ndarray) else numpy.array(Z) for Z in (X, B, T, W)
         )
         keep_indexes = (T > 0) & (B >= 0) & (B <= 1) & (W >= 0)
-        if sum(keep_indexes) < X.shape[0]:
-            n_removed = X.shape[0] - sum(keep_indexes)
+        n_removed = X.shape[0] - numpy.count_nonzero(keep_indexes)
+        if n_removed > 0:
             warnings.warn(
                 "Warning! Removed %d/%d entries from inputs where "
                 "T <= 0 or B not 0/1 or W < 0" % (n_removed, len(X)),
                 stacklevel=2,
             )
             X, B, T, W = (Z[keep_indexes] for Z in (X, B, T, W))
+        # The loss mixes all of them in float arithmetic, so convert them up
+        # front rather than on every evaluation
+        X, B, T, W = (
+            numpy.ascontiguousarray(Z, dtype=self._dtype) for Z in (X, B, T, W)
+        )
         n_features = X.shape[1]
 
         # scipy.optimize and emcee forces the the parameters to be a vector:
@@ -283,9 +447,19 @@ class GeneralizedGamma(RegressionModel):
         #  a, b, alpha_1...alpha_k, beta_1...beta_k)
         # Generalized Gamma is a bit sensitive to the starting point!
         x0 = numpy.zeros(6 + 2 * n_features)
-        x0[0] = +1 if self._fix_k is None else log(self._fix_k)
-        x0[1] = -1 if self._fix_p is None else log(self._fix_p)
-        args = (X, B, T, W, self._fix_k, self._fix_p, self._hierarchical, self._flavor)
+        x0[0] = +1 if self._fix_k is None else numpy.log(self._fix_k)
+        x0[1] = -1 if self._fix_p is None else numpy.log(self._fix_p)
+        args = (
+            X,
+            T,
+            numpy.log(T),
+            W * B,
+            W * (1 - B),
+            self._fix_k,
+            self._fix_p,
+            self._hierarchical,
+            self._flavor,
+        )
 
         # Set up progressbar and callback
         bar = progressbar.ProgressBar(
@@ -302,15 +476,37 @@ class GeneralizedGamma(RegressionModel):
         )
         value_history = []
 
-        def callback(LL: float) -> None:
-            value_history.append(LL)
-            bar.update(len(value_history), loss=LL)
-
-        # Define objective and use automatic differentiation
-        def f(x: tuple[float, ...]) -> float:
-            return -generalized_gamma_loss(x, *args, callback=callback)
-
-        jac = autograd.grad(lambda x: -generalized_gamma_loss(x, *args))
+        # Define objective and use automatic differentiation. SLSQP asks for
+        # the gradient at (some of) the points where it evaluated the objective,
+        # so keep the forward pass of the last evaluation around and only run
+        # the backward pass when the gradient is actually requested. The
+        # gradient is kept as well, as it is checked again at the optimum.
+        # With k = 1 (Exponential, Weibull) the gradient has a closed form
+        # that is cheap enough to always compute along with the value.
+        make_vjp = autograd.make_vjp(lambda x: -generalized_gamma_loss(x, *args))
+        last: dict[str, Any] = {}
+
+        def forward(x: numpy.ndarray) -> None:
+            if "x" not in last or not numpy.array_equal(last["x"], x):
+                last.pop("grad", None)
+                if self._fix_k == 1:
+                    value, grad = weibull_loss_and_grad(x, *args)
+                    last["value"], last["grad"] = -value, -grad
+                else:
+                    last["vjp"], last["value"] = make_vjp(x)
+                last["x"] = numpy.copy(x)
+
+        def f(x: numpy.ndarray) -> float:
+            forward(x)
+            value_history.append(-last["value"])
+            bar.update(len(value_history), loss=-last["value"])
+            return last["value"]  # type: ignore[no-any-return]
+
+        def jac(x: numpy.ndarray) -> numpy.ndarray:
+            forward(x)
+            if "grad" not in last:
+                last["grad"] = last["vjp"](1.0)
+            return last["grad"]  # type: ignore[no-any-return]
 
         # Find the maximum a posteriori of the distribution
         res = scipy.optimize.minimize(
@@ -322,9 +518,9 @@ class GeneralizedGamma(RegressionModel):
 
         # TODO: should not use fixed k/p as search parameters
         if self._fix_k:
-            result["map"][0] = log(self._fix_k)
+            result["map"][0] = numpy.log(self._fix_k)
         if self._fix_p:
-            result["map"][1] = log(self._fix_p)
+            result["map"][1] = numpy.log(self._fix_p)
 
         # Make sure we're in a local minimum
         gradient = jac(result["map"])
@@ -340,17 +536,8 @@ class GeneralizedGamma(RegressionModel):
         if self._mcmc:
             (dim,) = res.x.shape
             n_walkers = 5 * dim
-            sampler = emcee.EnsembleSampler(
-                nwalkers=n_walkers,
-                ndim=dim,
-                log_prob_fn=generalized_gamma_loss,
-                args=args,
-            )
             mcmc_initial_noise = 1e-3
-            p0 = [
-                result["map"] + mcmc_initial_noise * numpy.random.randn(dim)
-                for i in range(n_walkers)
-            ]
+            p0 = result["map"] + mcmc_initial_noise * numpy.random.randn(n_walkers, dim)
             n_burnin = 100
             n_steps = int(numpy.ceil(2000.0 / n_walkers))
             n_iterations = n_burnin + n_steps
@@ -366,24 +553,67 @@ class GeneralizedGamma(RegressionModel):
                     "]",
                 ],
             )
-            for i, _ in enumerate(sampler.sample(p0, iterations=n_iterations)):
-                bar.update(i + 1)
+            # Walkers are evaluated in a few vectorized batches, with at least one
+            # batch per process when using a pool. The data is handed to each
+            # process once, when the pool starts.
+            n_processes = (os.cpu_count() or 1) if self._n_jobs == -1 else self._n_jobs
+            with (
+                multiprocessing.Pool(
+                    n_processes, initializer=_init_pool_worker, initargs=args
+                )
+                if n_processes > 1
+                else contextlib.nullcontext()
+            ) as pool:
+
+                def log_prob_fn(xs: numpy.ndarray) -> numpy.ndarray:
+                    n_batches = max(
+                        n_processes, int(numpy.ceil(len(xs) * len(X) / _MAX_BATCH_SIZE))
+                    )
+                    batches = numpy.array_split(xs, min(n_batches, len(xs)))
+                    if pool is None:
+                        results = [generalized_gamma_loss(b, *args) for b in batches]
+                    else:
+                        # One message per process, each with its share of batches
+                        chunksize = -(-len(batches) // n_processes)
+                        results = pool.map(_pool_loss, batches, chunksize=chunksize)
+                    return numpy.concatenate(results)
+
+                sampler = emcee.EnsembleSampler(
+                    nwalkers=n_walkers,
+                    ndim=dim,
+                    log_prob_fn=log_prob_fn,
+                    vectorize=True,
+                    # Differential evolution mixes faster than the default
+                    # stretch move when there are many features
+                    moves=[
+                        (emcee.moves.DEMove(), 0.8),
+                        (emcee.moves.DESnookerMove(), 0.2),
+                    ],
+                )
+                for i, _ in enumerate(sampler.sample(p0, iterations=n_iterations)):
+                    bar.update(i + 1)
+            # (steps, walkers, dim) -> (dim, walkers * steps), keeping the
+            # samples of each walker together, in a single contiguous copy
             result["samples"] = (
-                sampler.get_chain()[n_burnin:, :, :].reshape(-1, dim, order="F").T
+                sampler.get_chain(discard=n_burnin).transpose(2, 1, 0).reshape(dim, -1)
             )
             if self._fix_k:
-                result["samples"][0, :] = log(self._fix_k)
+                result["samples"][0, :] = numpy.log(self._fix_k)
             if self._fix_p:
-                result["samples"][1, :] = log(self._fix_p)
+                result["samples"][1, :] = numpy.log(self._fix_p)
 
+        # alpha and beta of the posterior samples are stored as C-contiguous
+        # (n_samples, n_features) arrays, so that each sample is a single row
         self.params = {
             k: {
-                "k": exp(data[0]),
-                "p": exp(data[1]),
+                "k": numpy.exp(data[0]),
+                "p": numpy.exp(data[1]),
                 "a": data[4],
                 "b": data[5],
-                "alpha": data[6 : 6 + n_features].T,
-                "beta": data[6 + n_features : 6 + 2 * n_features].T,
+                "alpha": numpy.ascontiguousarray(data[6 : 6 + n_features].T),
+                "beta": numpy.ascontiguousarray(
+                    data[6 + n_features : 6 + 2 * n_features].T
+                ),
             }
             for k, data in result.items()
         }
@@ -391,14 +621,17 @@ class GeneralizedGamma(RegressionModel):
     def _predict(
         self, params: dict[str, Any], x: "ArrayLike", t: "ArrayLike"
     ) -> numpy.ndarray:
-        lambd = exp(dot(x, params["alpha"].T) + params["a"])
+        # .T of the C-contiguous (n_samples, n_features) posterior alpha and
+        # beta is a free view, which matmul hands to BLAS as a transposed matrix
+        lambd = numpy.exp(numpy.matmul(x, params["alpha"].T) + params["a"])
         if self._flavor == "logistic":
-            c = expit(dot(x, params["beta"].T) + params["b"])
+            c = scipy.special.expit(numpy.matmul(x, params["beta"].T) + params["b"])
         elif self._flavor == "linear":
-            c = dot(x, params["beta"].T) + params["b"]
+            c = numpy.matmul(x, params["beta"].T) + params["b"]
         else:
             raise ValueError("flavor must be one of `logistic` or `linear`")
-        M = c * gammainc(params["k"], (t * lambd) ** params["p"])
+        u = (t * lambd) ** params["p"]
+        M = c * scipy.special.gammainc(params["k"], u)
 
         return M  # type: ignore[no-any-return]
 
@@ -458,25 +691,23 @@ class GeneralizedGamma(RegressionModel):
             T = numpy.zeros((n_curves, n_samples))
         else:
             assert T.shape == (n_curves, n_samples)
-        B = numpy.zeros((n_curves, n_samples), dtype=numpy.bool)
-        C = numpy.zeros((n_curves, n_samples))
         params = self.params["samples"]
-        for i, j in enumerate(numpy.random.randint(len(params["k"]), size=n_curves)):
-            k = params["k"][j]
-            p = params["p"][j]
-            lambd = exp(dot(x, params["alpha"][j]) + params["a"][j])
-            c = expit(dot(x, params["beta"][j]) + params["b"][j])
-            z = numpy.random.uniform(size=(n_samples,))
-            cdf_now = c * gammainc(
-                k, numpy.multiply.outer(T[i], lambd) ** p
-            )  # why is this outer?
-            adjusted_z = cdf_now + (1 - cdf_now) * z
-            B[i] = adjusted_z < c
-            y = adjusted_z / c
-            w = gammaincinv(k, y)
-            # x = (t * lambd)**p
-            C[i] = w ** (1.0 / p) / lambd
-            C[i][~B[i]] = 0
+        # Draw all the curves at once, one posterior sample per row
+        js = numpy.random.randint(len(params["k"]), size=n_curves)
+        k = params["k"][js, numpy.newaxis]
+        p = params["p"][js, numpy.newaxis]
+        alpha_x = numpy.dot(params["alpha"][js], x) + params["a"][js]
+        beta_x = numpy.dot(params["beta"][js], x) + params["b"][js]
+        lambd = numpy.exp(alpha_x)[:, numpy.newaxis]
+        c = scipy.special.expit(beta_x)[:, numpy.newaxis]
+        z = numpy.random.uniform(size=(n_curves, n_samples))
+        cdf_now = c * scipy.special.gammainc(k, (T * lambd) ** p)
+        adjusted_z = cdf_now + (1 - cdf_now) * z
+        B = adjusted_z < c
+        y = adjusted_z / c
+        w = scipy.special.gammaincinv(k, y)
+        # x = (t * lambd)**p
+        C = numpy.where(B, w ** (1.0 / p) / lambd, 0.0)
 
         return B, C
 
@@ -504,9 +735,17 @@ class Exponential(GeneralizedGamma):
         mcmc: bool = False,
         hierarchical: bool = True,
         flavor: Literal["logistic", "linear"] = "logistic",
+        n_jobs: int = 1,
+        dtype: "DTypeLike" = numpy.float64,
     ) -> None:
         super().__init__(
-            mcmc=mcmc, hierarchical=hierarchical, flavor=flavor, fix_p=1, fix_k=1
+            mcmc=mcmc,
+            hierarchical=hierarchical,
+            flavor=flavor,
+            fix_p=1,
+            fix_k=1,
+            n_jobs=n_jobs,
+            dtype=dtype,
         )
 
 
@@ -528,9 +767,17 @@ class Weibull(GeneralizedGamma):
         mcmc: bool = False,
         hierarchical: bool = True,
         flavor: Literal["logistic", "linear"] = "logistic",
+        n_jobs: int = 1,
+        dtype: "DTypeLike" = numpy.float64,
     ) -> None:
         super().__init__(
-            mcmc=mcmc, hierarchical=hierarchical, flavor=flavor, fix_k=1, fix_p=None
+            mcmc=mcmc,
+            hierarchical=hierarchical,
+            flavor=flavor,
+            fix_k=1,
+            fix_p=None,
+            n_jobs=n_jobs,
+            dtype=dtype,
         )
 
 
@@ -555,7 +802,15 @@ class Gamma(GeneralizedGamma):
         mcmc: bool = False,
         hierarchical: bool = True,
         flavor: Literal["logistic", "linear"] = "logistic",
+        n_jobs: int = 1,
+        dtype: "DTypeLike" = numpy.float64,
     ) -> None:
         super().__init__(
-            mcmc=mcmc, hierarchical=hierarchical, flavor=flavor, fix_p=1, fix_k=None
+            mcmc=mcmc,
+            hierarchical=hierarchical,
+            flavor=flavor,
+            fix_p=1,
+            fix_k=None,
+            n_jobs=n_jobs,
+            dtype=dtype,
         )
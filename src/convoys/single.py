@@ -11,6 +11,32 @@ if TYPE_CHECKING:
 __all__ = ["KaplanMeier"]
 
 
+def _kaplan_meier(
+    B: numpy.ndarray, T: numpy.ndarray
+) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    # Returns the times, survival estimates, and Greenwood variance terms
+    # (on the log(-log) scale), each with a leading (0, 1, 0) entry.
+    # See https://www.math.wustl.edu/~sawyer/handouts/greenwood.pdf
+    # The outputs are preallocated and filled in place, saving the copies
+    # that prepending the leading entries would otherwise take.
+    order = numpy.lexsort((B, T))
+    B = B[order]
+    n = numpy.arange(len(T), 0, -1, dtype=float)  # number at risk
+    ts = numpy.empty(len(T) + 1)
+    ss = numpy.empty(len(T) + 1)
+    vs = numpy.empty(len(T) + 1)
+    ts[0], ss[0], vs[0] = 0.0, 1.0, 0.0
+    numpy.take(T, order, out=ts[1:])
+    numpy.cumprod(1 - B / n, out=ss[1:])
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        # B / (n * (n - B)) is inf when the last subject converts
+        sum_var_terms = numpy.cumsum(B / (n * (n - B)))
+        vs[1:] = numpy.where(
+            sum_var_terms > 0, 1 / numpy.log(ss[1:]) ** 2 * sum_var_terms, 0.0
+        )
+    return ts, ss, vs
+
+
 class SingleModel(ABC):
     @abstractmethod
     def fit(self, B: "ArrayLike", T: "ArrayLike") -> None:
@@ -40,82 +66,50 @@ class KaplanMeier(SingleModel):
             B = numpy.array(B)
         if not isinstance(T, numpy.ndarray):
             T = numpy.array(T)
-        # See https://www.math.wustl.edu/~sawyer/handouts/greenwood.pdf
-        BT = [
-            (b, t) for b, t in zip(B, T, strict=False) if t >= 0 and 0 <= float(b) <= 1
-        ]
-        if len(BT) < len(B):
-            n_removed = len(B) - len(BT)
+        keep_indexes = (T >= 0) & (B >= 0) & (B <= 1)
+        n_removed = len(B) - numpy.count_nonzero(keep_indexes)
+        if n_removed > 0:
             warnings.warn(
                 "Warning! Removed %d/%d entries from inputs where "
                 "T < 0 or B not 0/1" % (n_removed, len(B)),
                 stacklevel=2,
             )
-        B, T = ([z[i] for z in BT] for i in range(2))
-        n = len(T)
-        self._ts = [0.0]
-        self._ss = [1.0]
-        self._vs = [0.0]
-        sum_var_terms = 0.0
-        prod_s_terms = 1.0
-        for t, b in sorted(zip(T, B, strict=False)):
-            d = float(b)
-            self._ts.append(t)
-            prod_s_terms *= 1 - d / n
-            self._ss.append(prod_s_terms)
-            if d == n == 1:
-                sum_var_terms = float("inf")
-            else:
-                sum_var_terms += d / (n * (n - d))
-            if sum_var_terms > 0:
-                self._vs.append(1 / numpy.log(prod_s_terms) ** 2 * sum_var_terms)
-            else:
-                self._vs.append(0)
-            n -= 1
+            B, T = B[keep_indexes], T[keep_indexes]
+        self._ts, self._ss, self._vs = _kaplan_meier(
+            B.astype(float, copy=False), T.astype(float, copy=False)
+        )
 
         # Just prevent overflow warning when computing the confidence interval
         eps = 1e-9
         self._ss_clipped = numpy.clip(self._ss, eps, 1.0 - eps)
+        # Terms of the confidence interval that do not depend on t
+        self._log_neg_log_ss = numpy.log(-numpy.log(self._ss_clipped))
+        self._sqrt_vs = numpy.sqrt(self._vs)
 
     def predict(self, t: "ArrayLike") -> numpy.ndarray:
         """Returns the predicted values."""
-        t = numpy.array(t)
-        res = numpy.zeros(t.shape)
-        for indexes, value in numpy.ndenumerate(t):
-            j = numpy.searchsorted(self._ts, value, side="right") - 1
-            if j >= len(self._ts) - 1:
-                # Make the plotting stop at the last value of t
-                res[indexes] = float("nan")
-            else:
-                res[indexes] = 1 - self._ss[j]
-        return res
+        t = numpy.asarray(t)
+        j = numpy.searchsorted(self._ts, t, side="right") - 1
+        # Make the plotting stop at the last value of t
+        return numpy.where(j >= len(self._ts) - 1, numpy.nan, 1 - self._ss[j])
 
     def predict_ci(self, t: "ArrayLike", ci: float = 0.8) -> numpy.ndarray:
         """Returns the predicted values with a confidence interval."""
-        t = numpy.array(t)
-        res = numpy.zeros(t.shape + (3,))
-        for indexes, value in numpy.ndenumerate(t):
-            j = numpy.searchsorted(self._ts, value, side="right") - 1
-            if j >= len(self._ts) - 1:
-                # Make the plotting stop at the last value of t
-                res[indexes] = [float("nan")] * 3
-            else:
-                z_lo, z_hi = scipy.stats.norm.ppf([(1 - ci) / 2, (1 + ci) / 2])
-                res[indexes] = (
-                    1 - self._ss[j],
-                    1
-                    - numpy.exp(
-                        -numpy.exp(
-                            numpy.log(-numpy.log(self._ss_clipped[j]))
-                            + z_hi * self._vs[j] ** 0.5
-                        )
-                    ),
-                    1
-                    - numpy.exp(
-                        -numpy.exp(
-                            numpy.log(-numpy.log(self._ss_clipped[j]))
-                            + z_lo * self._vs[j] ** 0.5
-                        )
-                    ),
-                )
+        t = numpy.asarray(t)
+        j = numpy.searchsorted(self._ts, t, side="right") - 1
+        # The normal quantiles do not depend on t, and z_lo = -z_hi by symmetry
+        z_hi = scipy.stats.norm.ppf((1 + ci) / 2)
+        z_lo = -z_hi
+        log_neg_log_s = self._log_neg_log_ss[j]
+        sqrt_v = self._sqrt_vs[j]
+        res = numpy.stack(
+            (
+                1 - self._ss[j],
+                1 - numpy.exp(-numpy.exp(log_neg_log_s + z_hi * sqrt_v)),
+                1 - numpy.exp(-numpy.exp(log_neg_log_s + z_lo * sqrt_v)),
+            ),
+            axis=-1,
+        )
+        # Make the plotting stop at the last value of t
+        res[j >= len(self._ts) - 1] = numpy.nan
         return res
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import datetime
-from typing import TYPE_CHECKING, Any, Callable, Hashable, Literal, Sequence
+import itertools
+from typing import TYPE_CHECKING, Hashable, Literal, Sequence
 
 import numpy
 import pandas
@@ -13,22 +14,18 @@ __all__ = ["get_arrays"]
 
 
 def get_timescale(
-    t: datetime.timedelta | pandas.Timedelta, unit: "Unit" | None
-) -> tuple["Unit" | None, Callable[[Any], float]]:
+    t: datetime.timedelta | pandas.Timedelta | float, unit: "Unit" | None
+) -> tuple["Unit" | None, float | None]:
     """Take a datetime or a numerical type, return two things:
 
     1. A unit
-    2. A function that converts it to numerical form
+    2. The factor converting a number of seconds to that unit, or None if
+       `t` is numerical already
     """
 
-    def get_timedelta_converter(
-        t_factor: int | float,
-    ) -> Callable[[datetime.timedelta | pandas.Timedelta], float]:
-        return lambda td: td.total_seconds() * t_factor
-
-    if not isinstance(t, datetime.timedelta) or not isinstance(t, pandas.Timedelta):
+    if not isinstance(t, (datetime.timedelta, pandas.Timedelta)):
         # Assume numeric type
-        return None, lambda x: float(x)
+        return None, None
     for u, f in [
         ("years", 365.25 * 24 * 60 * 60),
         ("days", 24 * 60 * 60),
@@ -37,7 +34,7 @@ def get_timescale(
         ("seconds", 1),
     ]:
         if u == unit or (unit is None and t >= datetime.timedelta(seconds=f)):
-            return u, get_timedelta_converter(1.0 / f)  # type: ignore[return-value]
+            return u, 1.0 / f  # type: ignore[return-value]
     raise ValueError(f"Could not find unit for {t} and {unit}")
 
 
@@ -50,27 +47,42 @@ def get_groups(
     2. Pick the top groups
     3. Sort groups lexicographically
     """
-    group2count: dict[Hashable, int] = {}
-    for group in data:
-        group2count[group] = group2count.get(group, 0) + 1
-
-    groups = [group for group, count in group2count.items() if count >= group_min_size]
+    # Counts in order of first appearance, like the tie-breaking below expects
+    counts = data.value_counts(sort=False, dropna=False)
+    if isinstance(data.dtype, pandas.CategoricalDtype):
+        # These come in category order and include the unused categories
+        counts = counts.reindex(data.unique())
+    counts = counts[counts >= group_min_size]
     if max_groups >= 0:
-        groups = sorted(
-            groups,
-            key=group2count.get,  # type: ignore[arg-type]
-            reverse=True,
-        )[:max_groups]
+        counts = counts.sort_values(ascending=False, kind="stable")[:max_groups]
+    groups: list[Hashable] = counts.index.tolist()
     return sorted(groups, key=lambda g: (g is None, g))  # Put Nones last
 
 
-def _sub(a: datetime.datetime | Any, b: Any) -> Any:
-    # Computes a - b for a bunch of different cases
-    if isinstance(a, datetime.datetime) and a.tzinfo is not None:
-        return a.astimezone(b.tzinfo) - b
-    else:
-        # Either naive timestamps or numerical type
-        return a - b
+def _to_utc(column: pandas.Series) -> pandas.Series:
+    # Brings timezone-aware timestamps to UTC, which only changes their metadata
+    if isinstance(column.dtype, pandas.DatetimeTZDtype):
+        return column.dt.tz_convert("UTC")
+    if column.dtype == object:
+        inferred = pandas.api.types.infer_dtype(column, skipna=True)
+        if inferred == "datetime":
+            # Either naive datetimes, or timestamps with mixed timezones
+            aware = {value.tzinfo is not None for value in column.dropna()}
+            if len(aware) > 1:
+                raise TypeError(
+                    "Cannot mix timezone-naive and timezone-aware timestamps"
+                )
+            return pandas.to_datetime(column, utc=aware == {True})
+        if inferred == "date":
+            return pandas.to_datetime(column)
+    return column
+
+
+def _to_numpy(column: pandas.Series) -> numpy.ndarray:
+    # Timestamps become datetime64[ns] arrays, which drop the (UTC) timezone
+    if pandas.api.types.is_datetime64_any_dtype(column.dtype):
+        return column.to_numpy(dtype="datetime64[ns]")
+    return column.to_numpy()
 
 
 def get_arrays(
@@ -134,7 +146,8 @@ def get_arrays(
 
         `arrays` is a tuple of numpy arrays `(G, B, T)` or `(X, B, T)`
         containing the transformed input in numerical format. `G`, `B`, `T`
-        will all be 1D numpy arrays. `X` will be a 2D numpy array.
+        will all be 1D numpy arrays, of integers, booleans and floats
+        respectively. `X` will be a 2D numpy array.
     """
     # First, construct either the `X` or the `G` array
     if features is None and groups is None:
@@ -150,10 +163,13 @@ def get_arrays(
             )
     if groups is not None:
         groups_list = get_groups(data[groups], group_min_size, max_groups)
-        group2j = dict((group, j) for j, group in enumerate(groups_list))
-        # Remove rows for rare groups
-        data = data[data[groups].isin(group2j.keys())]
-        G = data[groups].apply(lambda g: group2j.get(g, -1)).to_numpy()
+        # Look up the index of every row's group in one pass; rows for rare
+        # groups get -1 and are removed
+        G = pandas.Index(groups_list).get_indexer(data[groups])  # type: ignore[no-untyped-call]
+        keep = G >= 0
+        if not keep.all():  # Most of the time no group is dropped
+            data = data[keep]
+            G = G[keep]
         retval = G
     else:
         groups_list = None
@@ -162,7 +178,24 @@ def get_arrays(
         # this creates an array of shape (n, k), whether features is a
         # single Series containing tuples of length k, or features is a
         # list of columns of length k.
-        X = numpy.array([numpy.array(z) for z in data[features].values])
+        if isinstance(features, str):
+            column = data[features]
+            if column.dtype == object and len(column):
+                # Fill the array straight from the tuples, without a list in between
+                k = len(column.iloc[0])
+                if not column.map(len).eq(k).all():
+                    raise ValueError(
+                        "All the `features` tuples must have the same length"
+                    )
+                X = numpy.fromiter(
+                    itertools.chain.from_iterable(column),
+                    dtype=numpy.float64,
+                    count=len(column) * k,
+                ).reshape(len(column), k)
+            else:
+                X = column.to_numpy().reshape(-1, 1)
+        else:
+            X = data[features].to_numpy()
         retval = X
 
     # Next, construct the `B` and `T` arrays
@@ -178,28 +211,45 @@ def get_arrays(
         now = "now"
     if created is None and "created" in data.columns:
         created = "created"
-    B = ~pandas.isnull(data[converted]).to_numpy()
-
-    def _calculate_T(row: pandas.Series) -> Any:
-        if not pandas.isnull(row[converted]):
-            if created is not None:
-                return _sub(row[converted], row[created])
-            else:
-                return row[converted]
+    B = data[converted].notna().to_numpy()
+
+    # Time until conversion for converted rows, and until now for the others
+    T_deltas: numpy.ndarray
+    if created is not None:
+        # Timestamps are normalized once, then subtracted as plain arrays
+        names = [name for name in (created, converted, now) if name is not None]
+        columns = [_to_utc(data[name]) for name in names]
+        tzs = {
+            str(column.dt.tz)
+            for column in columns
+            if pandas.api.types.is_datetime64_any_dtype(column.dtype)
+        }
+        if len(tzs) > 1:
+            raise TypeError("Cannot mix timezone-naive and timezone-aware timestamps")
+        created_arr, converted_arr, *now_arrs = [_to_numpy(c) for c in columns]
+        now_arr: numpy.ndarray | numpy.datetime64
+        if now_arrs:
+            now_arr = now_arrs[0]
         else:
-            if created is not None:
-                if now is not None:
-                    return _sub(row[now], row[created])
-                else:
-                    return datetime.datetime.now(tz=row[created].tzinfo) - row[created]
-            elif now is not None:
-                return row[now]
-            else:
-                return datetime.datetime.now()
-
-    T_deltas = data.apply(_calculate_T, axis=1)
-    max_T_delta = T_deltas.max()
-    unit, converter = get_timescale(max_T_delta, unit)
-    T = T_deltas.apply(converter).to_numpy()
-
+            now_ts = pandas.Timestamp.now(tz=None if "None" in tzs else "UTC")
+            now_arr = now_ts.tz_localize(None).to_datetime64()
+        T_deltas = now_arr - created_arr
+        if B.any():  # converted may hold no timestamps at all otherwise
+            T_deltas = numpy.where(B, converted_arr - created_arr, T_deltas)
+    else:
+        T_now = data[now] if now is not None else datetime.datetime.now()
+        T_deltas = data[converted].where(B, T_now).to_numpy()
+    max_T_delta = pandas.Series(T_deltas).max()  # ignores NaT and NaN
+    unit, t_factor = get_timescale(max_T_delta, unit)
+    if t_factor is None:
+        T = T_deltas.astype(numpy.float64, copy=False)
+    else:
+        T = T_deltas / numpy.timedelta64(1, "s") * t_factor  # NaT becomes NaN
+
+    # Hand the models contiguous arrays of fixed dtypes, without copying
+    # whatever already matches
+    if groups_list is not None:
+        retval = numpy.ascontiguousarray(retval, dtype=numpy.intp)
+    B = numpy.ascontiguousarray(B, dtype=numpy.bool_)
+    T = numpy.ascontiguousarray(T, dtype=numpy.float64)
     return unit, groups_list, (retval, B, T)
@@ -1,5 +1,4 @@
-import datetime
-import random
+from typing import Hashable, Literal
 
 import matplotlib
 import numpy
@@ -7,23 +6,31 @@ import pandas
 import pytest
 import scipy.stats  # type: ignore[import-untyped]
 
+import convoys.utils
+
 matplotlib.use("Agg")  # Needed for matplotlib to run in Travis
 
+WeibullArrays = tuple[
+    str | None,
+    list[Hashable] | None,
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray],
+]
+
 
 class Utilities:
     @staticmethod
-    def sample_weibull(k: float, lambd: float) -> float:
+    def sample_weibull_batch(k: float, lambd: float, size: int) -> numpy.ndarray:
         # scipy.stats is garbage for this
         # exp(-(x * lambda)^k) = y
-        base: numpy.float64 = -numpy.log(random.random())
-        return base ** (1.0 / k) / lambd
+        u = numpy.random.random(size)
+        return (-numpy.log(u)) ** (1.0 / k) / lambd
 
     @staticmethod
     def generate_censored_data(
         N: numpy.ndarray, E: numpy.ndarray, C: numpy.ndarray
     ) -> tuple[numpy.ndarray, numpy.ndarray]:
-        B = numpy.array([c and e < n for n, e, c in zip(N, E, C, strict=False)])
-        T = numpy.array([e if b else n for e, b, n in zip(E, B, N, strict=False)])
+        B = C.astype(bool, copy=False) & (E < N)
+        T = numpy.where(B, E, N)
         return B, T
 
 
@@ -37,21 +44,24 @@ def generate_weibull_df() -> pandas.DataFrame:
     k = 0.5
     lambd = 0.1
     n = 1000
-    groups = [r % len(cs) for r in range(n)]
-    C = numpy.array([bool(random.random() < cs[g]) for g in groups])
+    groups = (numpy.arange(n) % len(cs)).astype(numpy.int8)
+    C = numpy.random.random(n) < numpy.take(cs, groups)
     N = scipy.stats.expon.rvs(scale=10.0 / lambd, size=(n,))
-    E = numpy.array([Utilities.sample_weibull(k, lambd) for r in range(n)])
+    E = Utilities.sample_weibull_batch(k, lambd, n)
     B, T = Utilities.generate_censored_data(N, E, C)
 
-    def x2t(x: int) -> datetime.datetime:
-        return datetime.datetime(2000, 1, 1) + datetime.timedelta(days=x)
-
+    base = pandas.Timestamp(2000, 1, 1)
     return pandas.DataFrame(
         data=dict(
-            group=["Group %d" % g for g in groups],
-            created=[x2t(0) for g in groups],
-            converted=[x2t(t) if b else None for t, b in zip(T, B, strict=False)],
-            now=[x2t(n) for n in N],
+            group=pandas.Categorical.from_codes(
+                groups,  # type: ignore[arg-type]
+                categories=pandas.Index(["Group %d" % g for g in range(len(cs))]),
+            ),
+            created=numpy.full(n, base, dtype="datetime64[ns]"),
+            converted=(
+                base + pandas.to_timedelta(numpy.where(B, T, numpy.nan), unit="D")
+            ).as_unit("ns"),
+            now=(base + pandas.to_timedelta(N, unit="D")).as_unit("ns"),
         )
     )
 
@@ -61,4 +71,30 @@ weibull_data = generate_weibull_df()
 
 @pytest.fixture(scope="function")
 def weibull_df() -> pandas.DataFrame:
+    # Shared between tests, so it must not be modified; use weibull_df_mut for that
+    return weibull_data
+
+
+@pytest.fixture(scope="function")
+def weibull_df_mut() -> pandas.DataFrame:
     return weibull_data.copy()
+
+
+def _get_weibull_arrays(
+    unit: Literal["years", "days"] | None = None,
+) -> WeibullArrays:
+    chosen_unit, groups, arrays = convoys.utils.get_arrays(weibull_data, unit=unit)
+    # Shared between tests, so make sure none of them modifies the arrays
+    for array in arrays:
+        array.flags.writeable = False
+    return chosen_unit, groups, arrays
+
+
+@pytest.fixture(scope="session")
+def weibull_arrays() -> WeibullArrays:
+    return _get_weibull_arrays()
+
+
+@pytest.fixture(scope="session")
+def weibull_arrays_days() -> WeibullArrays:
+    return _get_weibull_arrays(unit="days")
@@ -1,18 +1,22 @@
 import datetime
+import itertools
 import random
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
+import autograd  # type: ignore[import-untyped]
 import flaky
 import matplotlib
 import numpy
 import pandas
 import pytest
+import scipy.special  # type: ignore[import-untyped]
 import scipy.stats  # type: ignore[import-untyped]
 from numpy.typing import ArrayLike
 
 matplotlib.use("Agg")  # Needed for matplotlib to run in Travis
 import convoys
+import convoys.export
 import convoys.multi
 import convoys.plotting
 import convoys.regression
@@ -20,7 +24,7 @@ import convoys.single
 import convoys.utils
 
 if TYPE_CHECKING:
-    from tests.conftest import Utilities
+    from tests.conftest import Utilities, WeibullArrays
 
 
 def test_kaplan_meier_model() -> None:
@@ -43,6 +47,20 @@ def test_kaplan_meier_model() -> None:
     assert m.predict(0, 9) == 0.75
 
 
+def test_kaplan_meier_n_jobs(weibull_arrays_days: "WeibullArrays") -> None:
+    unit, groups, (G, B, T) = weibull_arrays_days
+    assert groups is not None
+    t = numpy.linspace(0, 100, 11)
+    sequential = convoys.multi.KaplanMeier()
+    sequential.fit(G, B, T)
+    threaded = convoys.multi.KaplanMeier(n_jobs=-1)
+    threaded.fit(G, B, T)
+    for j in range(len(groups)):
+        numpy.testing.assert_array_equal(
+            threaded.predict(j, t), sequential.predict(j, t)
+        )
+
+
 def test_output_shapes(
     utilities: "Utilities",
     c: float = 0.3,
@@ -82,6 +100,12 @@ def test_output_shapes(
     assert model.predict(X[0], 0).shape == ()
     assert model.predict([X[0], X[1]], [0, 1]).shape == (2,)
 
+    # Fit model with ci, sampling in parallel (should be the same)
+    model = convoys.regression.Exponential(mcmc=True, n_jobs=2)
+    model.fit(X, B, T)
+    assert model.predict_ci(X[0], 0, ci=0.8).shape == (3,)
+    assert model.predict_ci([X[0]], [0, 1, 2, 3], ci=0.8).shape == (4, 3)
+
 
 @flaky.flaky
 def test_exponential_regression_model(
@@ -136,7 +160,7 @@ def test_weibull_regression_model(
     X = numpy.array([[r % len(cs) == j for j in range(len(cs))] for r in range(n)])
     C = numpy.array([bool(random.random() < cs[r % len(cs)]) for r in range(n)])
     N = scipy.stats.uniform.rvs(scale=5.0 / lambd, size=(n,))
-    E = numpy.array([utilities.sample_weibull(k, lambd) for r in range(n)])
+    E = utilities.sample_weibull_batch(k, lambd, n)
     B, T = utilities.generate_censored_data(N, E, C)
 
     model = convoys.regression.Weibull()
@@ -202,7 +226,7 @@ def test_linear_model(
     X = numpy.random.binomial(n=1, p=0.5, size=(n, m))
     C = numpy.random.rand(n) < numpy.dot(X, cs.T)
     N = scipy.stats.uniform.rvs(scale=20.0 / lambd, size=(n,))
-    E = numpy.array([utilities.sample_weibull(k, lambd) for r in range(n)])
+    E = utilities.sample_weibull_batch(k, lambd, n)
     B, T = utilities.generate_censored_data(N, E, C)
 
     model = convoys.regression.Weibull(mcmc=False, flavor="linear")
@@ -262,14 +286,97 @@ def test_exponential_pooling(
     assert numpy.all(numpy.diff(c) < 0)  # c should be monotonically decreasing
 
 
+def test_gammainc_grad() -> None:
+    k = numpy.array([0.5, 1.0, 3.0, 10.0])
+    u = numpy.array([0.3, 2.0, 2.5, 12.0])
+    h = 1e-6
+
+    def f(k: numpy.ndarray, u: numpy.ndarray) -> numpy.ndarray:
+        return scipy.special.gammainc(k, u)  # type: ignore[no-any-return]
+
+    grad_k = autograd.grad(lambda k: convoys.regression.gammainc(k, u).sum())(k)
+    numpy.testing.assert_allclose(
+        grad_k, (f(k + h, u) - f(k - h, u)) / (2 * h), rtol=1e-6
+    )
+    grad_u = autograd.grad(lambda u: convoys.regression.gammainc(k, u).sum())(u)
+    numpy.testing.assert_allclose(
+        grad_u, (f(k, u + h) - f(k, u - h)) / (2 * h), rtol=1e-6
+    )
+
+
+@pytest.mark.parametrize("flavor", ["logistic", "linear"])
+@pytest.mark.parametrize("fix_p", [None, 1])
+def test_weibull_loss_and_grad(
+    fix_p: int | None, flavor: Literal["logistic", "linear"]
+) -> None:
+    n, n_features = 100, 3
+    X = numpy.random.rand(n, n_features)
+    T = numpy.random.uniform(0.1, 5.0, size=(n,))
+    B = numpy.random.rand(n) < 0.4
+    W = numpy.random.rand(n)
+    x = 0.3 * numpy.random.randn(6 + 2 * n_features)
+    args = (X, T, numpy.log(T), W * B, W * (1 - B), 1, fix_p, True, flavor)
+    value, grad = convoys.regression.weibull_loss_and_grad(x, *args)
+    assert value == pytest.approx(convoys.regression.generalized_gamma_loss(x, *args))
+    numpy.testing.assert_allclose(
+        grad,
+        autograd.grad(lambda x: convoys.regression.generalized_gamma_loss(x, *args))(x),
+        rtol=1e-9,
+        atol=1e-12,
+    )
+
+
+def test_float32_regression_model(weibull_arrays_days: "WeibullArrays") -> None:
+    unit, groups, (G, B, T) = weibull_arrays_days
+    t = numpy.linspace(0, 100, 11)
+    for model_cls in (convoys.multi.Weibull, convoys.multi.GeneralizedGamma):
+        model_64 = model_cls()
+        model_64.fit(G, B, T)
+        model_32 = model_cls(dtype=numpy.float32)
+        model_32.fit(G, B, T)
+        numpy.testing.assert_allclose(
+            model_32.predict_many([0, 1], t),
+            model_64.predict_many([0, 1], t),
+            atol=1e-2,
+        )
+
+
+@pytest.mark.parametrize(
+    "model_cls", [convoys.multi.KaplanMeier, convoys.multi.Weibull]
+)
+def test_predict_many(
+    model_cls: type[convoys.multi.KaplanMeier | convoys.multi.Weibull],
+    weibull_arrays_days: "WeibullArrays",
+) -> None:
+    unit, groups, (G, B, T) = weibull_arrays_days
+    model = model_cls()
+    model.fit(G, B, T)
+    t = numpy.linspace(0, 100, 11)
+    js = [2, 0]
+    expected = numpy.stack([model.predict(j, t) for j in js])
+    numpy.testing.assert_allclose(model.predict_many(js, t), expected)
+
+
 def test_convert_dataframe(weibull_df: pandas.DataFrame) -> None:
     df = weibull_df
     unit, groups, (G, B, T) = convoys.utils.get_arrays(df)
     assert G.shape == B.shape == T.shape == (len(df),)
 
 
-def test_convert_dataframe_features(weibull_df: pandas.DataFrame) -> None:
-    df = weibull_df
+def test_get_timescale() -> None:
+    assert convoys.utils.get_timescale(datetime.timedelta(days=3), None) == (
+        "days",
+        1.0 / (24 * 60 * 60),
+    )
+    assert convoys.utils.get_timescale(pandas.Timedelta(hours=3), "minutes") == (
+        "minutes",
+        1.0 / 60,
+    )
+    assert convoys.utils.get_timescale(3.0, None) == (None, None)
+
+
+def test_convert_dataframe_features(weibull_df_mut: pandas.DataFrame) -> None:
+    df = weibull_df_mut
     df["features"] = [
         tuple(numpy.random.randn() for z in range(3)) for g in df["group"]
     ]
@@ -278,9 +385,29 @@ def test_convert_dataframe_features(weibull_df: pandas.DataFrame) -> None:
     assert X.shape == (len(df), 3)
 
 
-def test_convert_dataframe_features_multi_cols(weibull_df: pandas.DataFrame) -> None:
+def test_convert_dataframe_features_ragged_raises(
+    weibull_df_mut: pandas.DataFrame,
+) -> None:
+    df = weibull_df_mut
+    df["features"] = [(1.0, 2.0), (3.0, 4.0, 5.0)] + [(6.0, 7.0)] * (len(df) - 2)
+    df = df.drop("group", axis=1)
+    with pytest.raises(ValueError):
+        convoys.utils.get_arrays(df)
+
+
+def test_convert_dataframe_features_numeric(weibull_df_mut: pandas.DataFrame) -> None:
+    df = weibull_df_mut
+    df["f"] = numpy.random.randn(len(df))
+    unit, groups, (X, B, T) = convoys.utils.get_arrays(df, features="f")
+    assert X.shape == (len(df), 1)
+    numpy.testing.assert_array_equal(X[:, 0], df["f"])
+
+
+def test_convert_dataframe_features_multi_cols(
+    weibull_df_mut: pandas.DataFrame,
+) -> None:
     # Generate from multiple columns
-    df = weibull_df
+    df = weibull_df_mut
     df["feature_1"] = [numpy.random.randn() for g in df["group"]]
     df["feature_2"] = [numpy.random.randn() for g in df["group"]]
     df = df.drop("group", axis=1)
@@ -290,8 +417,8 @@ def test_convert_dataframe_features_multi_cols(weibull_df: pandas.DataFrame) ->
     assert X.shape == (len(df), 2)
 
 
-def test_convert_dataframe_infer_now(weibull_df: pandas.DataFrame) -> None:
-    df = weibull_df
+def test_convert_dataframe_infer_now(weibull_df_mut: pandas.DataFrame) -> None:
+    df = weibull_df_mut
     df = df.drop("now", axis=1)
 
     unit, groups, (G1, B1, T1) = convoys.utils.get_arrays(df, unit="days")
@@ -317,6 +444,89 @@ def test_convert_dataframe_infer_now(weibull_df: pandas.DataFrame) -> None:
         assert 0 <= t3 - t1 < 3.0 / (24 * 60 * 60)
 
 
+def test_convert_dataframe_mixed_timezones(weibull_df: pandas.DataFrame) -> None:
+    df = weibull_df
+    unit, groups, (G1, B1, T1) = convoys.utils.get_arrays(df, unit="days")
+
+    # Give every row its own timezone, which pandas stores as objects
+    tzs = [datetime.timezone(datetime.timedelta(hours=h)) for h in range(-11, 12)]
+    df2 = pandas.DataFrame(
+        {
+            col: [
+                pandas.NaT if pandas.isna(z) else z.tz_localize("UTC").tz_convert(tz)
+                for z, tz in zip(df[col], itertools.cycle(tzs), strict=False)
+            ]
+            for col in ["created", "converted", "now"]
+        }
+    )
+    df2["group"] = df["group"]
+    assert df2["created"].dtype == object
+    unit, groups, (G2, B2, T2) = convoys.utils.get_arrays(df2, unit="days")
+    numpy.testing.assert_array_equal(B1, B2)
+    numpy.testing.assert_allclose(T1, T2)
+
+    # Without a now column, the deltas are computed against the current time
+    unit, groups, (G3, B3, T3) = convoys.utils.get_arrays(
+        df2.drop("now", axis=1), unit="days"
+    )
+    assert numpy.all(T3[~B3] > 0)
+
+
+def test_convert_dataframe_dates() -> None:
+    df = pandas.DataFrame(
+        {
+            "group": ["a", "b"],
+            "created": [datetime.date(2020, 1, 1), datetime.date(2020, 1, 2)],
+            "converted": [datetime.date(2020, 1, 3), None],
+            "now": [datetime.date(2020, 1, 10), datetime.date(2020, 1, 10)],
+        }
+    )
+    assert df["created"].dtype == object
+    unit, groups, (G, B, T) = convoys.utils.get_arrays(df, unit="days")
+    numpy.testing.assert_array_equal(B, [True, False])
+    numpy.testing.assert_array_equal(T, [2.0, 8.0])
+
+
+def test_convert_dataframe_naive_objects() -> None:
+    df = pandas.DataFrame(
+        {
+            "group": ["a", "b"],
+            "created": pandas.to_datetime(["2020-01-01", "2020-01-02"]),
+            "converted": pandas.Series(
+                [datetime.datetime(2020, 1, 3), None], dtype=object
+            ),
+            "now": pandas.to_datetime(["2020-01-10", "2020-01-10"]),
+        }
+    )
+    unit, groups, (G, B, T) = convoys.utils.get_arrays(df, unit="days")
+    numpy.testing.assert_array_equal(B, [True, False])
+    numpy.testing.assert_array_equal(T, [2.0, 8.0])
+
+
+def test_convert_dataframe_naive_and_aware_raises(
+    weibull_df: pandas.DataFrame,
+) -> None:
+    df = weibull_df.assign(created=weibull_df["created"].dt.tz_localize("UTC"))
+    with pytest.raises(TypeError):
+        convoys.utils.get_arrays(df)
+
+
+@pytest.mark.parametrize("aware_first", [True, False])
+def test_convert_dataframe_naive_and_aware_objects_raises(aware_first: bool) -> None:
+    naive = datetime.datetime(2020, 1, 3)
+    aware = datetime.datetime(2020, 1, 3, tzinfo=datetime.timezone.utc)
+    df = pandas.DataFrame(
+        {
+            "group": ["a", "b"],
+            "created": [naive, naive],
+            "converted": [aware, naive] if aware_first else [naive, aware],
+            "now": [naive, naive],
+        }
+    )
+    with pytest.raises(TypeError):
+        convoys.utils.get_arrays(df)
+
+
 def test_convert_dataframe_timedeltas(weibull_df: pandas.DataFrame) -> None:
     df = weibull_df
 
@@ -343,8 +553,17 @@ def test_convert_dataframe_more_args(weibull_df: pandas.DataFrame) -> None:
     assert G.shape == (0,)
 
 
-def test_convert_dataframe_created_at_nan(weibull_df: pandas.DataFrame) -> None:
-    df = weibull_df
+def test_convert_dataframe_unused_category(weibull_df: pandas.DataFrame) -> None:
+    df = weibull_df[weibull_df["group"] != "Group 2"]
+    assert "Group 2" in df["group"].cat.categories
+    unit, groups, (G, B, T) = convoys.utils.get_arrays(df)
+    assert groups == ["Group 0", "Group 1"]
+    result_df = convoys.export.export_cohorts(G, B, T, groups=groups)
+    assert set(result_df["group"]) == set(groups)
+
+
+def test_convert_dataframe_created_at_nan(weibull_df_mut: pandas.DataFrame) -> None:
+    df = weibull_df_mut
     df.loc[df.index[0], "created"] = None
     unit, groups, (G, B, T) = convoys.utils.get_arrays(df)
     assert numpy.issubdtype(G.dtype, numpy.integer)
@@ -370,10 +589,9 @@ def test_plot_cohorts(
         "kaplan-meier", "exponential", "weibull", "gamma", "generalized-gamma"
     ]
     | None,
-    weibull_df: pandas.DataFrame,
+    weibull_arrays: "WeibullArrays",
 ) -> None:
-    df = weibull_df
-    unit, groups, (G, B, T) = convoys.utils.get_arrays(df)
+    unit, groups, (G, B, T) = weibull_arrays
     matplotlib.pyplot.clf()
     convoys.plotting.plot_cohorts(G, B, T, model=model, ci=0.95, groups=groups)
     matplotlib.pyplot.legend()
@@ -391,17 +609,15 @@ def test_plot_cohorts(
     )
 
 
-def test_plot_cohorts_bad_model_raises(weibull_df: pandas.DataFrame) -> None:
-    df = weibull_df
-    unit, groups, (G, B, T) = convoys.utils.get_arrays(df)
+def test_plot_cohorts_bad_model_raises(weibull_arrays: "WeibullArrays") -> None:
+    unit, groups, (G, B, T) = weibull_arrays
 
     with pytest.raises(ValueError):
         convoys.plotting.plot_cohorts(G, B, T, model="bad", groups=groups)  # type: ignore[arg-type]
 
 
-def test_plot_cohorts_bad_groups_raises(weibull_df: pandas.DataFrame) -> None:
-    df = weibull_df
-    unit, groups, (G, B, T) = convoys.utils.get_arrays(df)
+def test_plot_cohorts_bad_groups_raises(weibull_arrays: "WeibullArrays") -> None:
+    unit, groups, (G, B, T) = weibull_arrays
 
     with pytest.raises(ValueError):
         convoys.plotting.plot_cohorts(
@@ -409,13 +625,55 @@ def test_plot_cohorts_bad_groups_raises(weibull_df: pandas.DataFrame) -> None:
         )
 
 
-def test_plot_cohorts_subplots(weibull_df: pandas.DataFrame) -> None:
-    df = weibull_df
-    unit, groups, (G, B, T) = convoys.utils.get_arrays(df)
+@pytest.mark.parametrize("spacing", ["linear", "log"])
+@pytest.mark.parametrize("t_max", [None, 0])
+def test_plot_cohorts_spacing(
+    spacing: Literal["linear", "log"],
+    t_max: float | None,
+    weibull_arrays: "WeibullArrays",
+) -> None:
+    unit, groups, (G, B, T) = weibull_arrays
+    matplotlib.pyplot.clf()
+    convoys.plotting.plot_cohorts(
+        G, B, T, t_max=t_max, groups=groups, n_points=50, spacing=spacing
+    )
+    line = matplotlib.pyplot.gca().get_lines()[0]
+    t = numpy.asarray(line.get_xdata())
+    assert len(t) == 50
+    assert t[0] == 0
+    if t_max is None:
+        assert t[-1] == pytest.approx(T.max())
+        if spacing == "log":
+            assert t[1] == pytest.approx(T.max() / 1000, rel=1e-5)
+    else:
+        assert numpy.all(t == 0)
+
+
+@pytest.mark.parametrize("kwargs", [dict(spacing="bad"), dict(n_points=1)])
+def test_plot_cohorts_bad_points_raises(
+    kwargs: dict[str, Any],
+    weibull_arrays: "WeibullArrays",
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    unit, groups, (G, B, T) = weibull_arrays
+
+    # The arguments should be rejected before any model is fit
+    def _get_model(*args: Any) -> None:
+        raise AssertionError("the model was fit")
+
+    monkeypatch.setattr(convoys.multi, "_get_model", _get_model)
+    with pytest.raises(ValueError):
+        convoys.plotting.plot_cohorts(G, B, T, groups=groups, **kwargs)
+
+
+def test_plot_cohorts_subplots(weibull_arrays: "WeibullArrays") -> None:
+    unit, groups, (G, B, T) = weibull_arrays
     matplotlib.pyplot.clf()
     fix, axes = matplotlib.pyplot.subplots(nrows=2, ncols=2)
+    model = convoys.multi.KaplanMeier()
+    model.fit(G, B, T)
     for ax in axes.flatten():
-        convoys.plotting.plot_cohorts(G, B, T, groups=groups, ax=ax)
+        convoys.plotting.plot_cohorts(G, B, T, model=model, groups=groups, ax=ax)
         ax.legend()
     here = Path(__file__)
     snapshots_dir = here.parent / "snapshots"
@@ -1,11 +1,12 @@
 from math import floor
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
-import pandas
 import pytest
 
 import convoys.export
-import convoys.utils
+
+if TYPE_CHECKING:
+    from tests.conftest import WeibullArrays
 
 
 @pytest.mark.parametrize(
@@ -20,10 +21,9 @@ def test_export_cohorts(
     model: Literal[
         "kaplan-meier", "exponential", "weibull", "gamma", "generalized-gamma"
     ],
-    weibull_df: pandas.DataFrame,
+    weibull_arrays_days: "WeibullArrays",
 ) -> None:
-    df = weibull_df
-    unit, groups, (G, B, T) = convoys.utils.get_arrays(df, unit="days")
+    unit, groups, (G, B, T) = weibull_arrays_days
     assert groups is not None
 
     result_df = convoys.export.export_cohorts(
@@ -31,6 +31,7 @@ def test_export_cohorts(
     )
 
     assert set(result_df["group"]) == set(groups)
+    assert result_df["group"].dtype == object
 
     assert result_df["t"].dtype == int
     assert max(T) - 1 <= max(result_df["t"]) == floor(max(T))
@@ -38,19 +39,27 @@ def test_export_cohorts(
 
     assert 0 <= min(result_df["prediction_value"])
     assert max(result_df["prediction_value"]) <= 1
+    assert result_df["prediction_value"].dtype == "float32"
+
+
+def test_export_cohorts_integer_groups(weibull_arrays: "WeibullArrays") -> None:
+    unit, groups, (G, B, T) = weibull_arrays
+
+    result_df = convoys.export.export_cohorts(G, B, T)
+
+    assert set(result_df["group"]) == set(range(len(groups or [])))
+    assert result_df["group"].dtype == "int64"
 
 
-def test_export_cohorts_bad_model_raises(weibull_df: pandas.DataFrame) -> None:
-    df = weibull_df
-    unit, groups, (G, B, T) = convoys.utils.get_arrays(df)
+def test_export_cohorts_bad_model_raises(weibull_arrays: "WeibullArrays") -> None:
+    unit, groups, (G, B, T) = weibull_arrays
 
     with pytest.raises(ValueError):
         convoys.export.export_cohorts(G, B, T, model="bad", groups=groups)  # type: ignore[arg-type]
 
 
-def test_export_cohorts_bad_groups_raises(weibull_df: pandas.DataFrame) -> None:
-    df = weibull_df
-    unit, groups, (G, B, T) = convoys.utils.get_arrays(df)
+def test_export_cohorts_bad_groups_raises(weibull_arrays: "WeibullArrays") -> None:
+    unit, groups, (G, B, T) = weibull_arrays
 
     with pytest.raises(ValueError):
         convoys.export.export_cohorts(